@@ -11,6 +11,12 @@ parent = path.dirname(path.dirname(path.abspath(__file__)))
 # we use `data` unless the user overrides with marmots_DATA_DIR
 data_directory = os.getenv("MARMOTS_DATA_DIR") or path.join(parent, "data")
 
+# the directory where we cache files generated at runtime - this defaults to
+# the user's cache directory unless overridden with MARMOTS_CACHE_DIR
+cache_directory = os.getenv("MARMOTS_CACHE_DIR") or path.join(
+    os.getenv("XDG_CACHE_HOME") or path.join(path.expanduser("~"), ".cache"), "marmots"
+)
+
 # the directory where we store test figures
 figdir = path.join(parent, *("tests", "figures"))
 
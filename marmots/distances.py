@@ -153,15 +153,13 @@ def calculate(
             # calculate the SNR
             SNR = V / vrms
 
-            # and check for a trigger
-            trigger[in_sight] = SNR > trigger_SNR
-            
             #cut all decay points that appear above the horizon
             height = Ag.stations[i]["geodetic"][2]
 
             above = (np.pi/2) - theta > geometry.horizon_angle(height)
 
-            trigger[in_sight][above] = 0.0
+            # and check for a trigger
+            trigger[in_sight] = (SNR > trigger_SNR) & ~above
 
             distances.append(dbeacon[trigger[in_sight].astype(bool)])
 
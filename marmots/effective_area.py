@@ -2,6 +2,7 @@
 This module provides the high-level event loop to calculate
 the tau point source effective area.
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Union
 
 import numpy as np
@@ -28,6 +29,7 @@ def calculate(
     freqs: np.ndarray = np.arange(30,80,10)+5,
     trigger_SNR: float = 5.0,
     min_elev: float = np.deg2rad(-30),
+    max_workers: int = 1,
 ) -> np.ndarray:
 
     """
@@ -54,6 +56,8 @@ def calculate(
         The frequencies at which to calculate the electric field (in MHz).
     trigger_SNR: float
         The SNR needed for a trigger.
+    max_workers: int
+        The number of threads used to evaluate the stations (1 is serial).
 
     Returns
     -------
@@ -87,8 +91,8 @@ def calculate(
         # and then sample the energy of the tau's
         Eshower = taudecay.shower_energy(Etau)
 
-        # location of the decay
-        decay_point = Ag.trials + (Ag.axis[:,None] * decay_length).T
+        # location of the decay - np.outer gives a C-contiguous (N, 3) array
+        decay_point = Ag.trials + np.outer(decay_length, Ag.axis)
 
         # and get the altitude at the decay points
         decay_altitude = geometry.norm(decay_point) - Re 
@@ -102,47 +106,77 @@ def calculate(
 
         n_stations = len(Ag.stations)
 
-        triggers = np.zeros(Ag.trials.shape[0])
+        # the angles passed into the voltage calculation (in degrees) - the
+        # geometry is computed in double precision but the voltage only
+        # needs single precision inputs which halves their memory traffic
+        exit_zenith_deg = np.rad2deg(exit_zenith, dtype=np.float32)
+        decay_zenith_deg = np.rad2deg(decay_zenith, dtype=np.float32)
+        decay_azimuth_deg = np.rad2deg(decay_azimuth, dtype=np.float32)
 
-        # iterate over stations
-        for i in range(n_stations):
-            
-            ground_view = geometry.view_angle(Ag.trials, Ag.stations[i]["geocentric"], Ag.axis) 
+        # and the same for the decay altitudes, lengths, and shower energies
+        decay_altitude_f32 = decay_altitude.astype(np.float32)
+        decay_length_f32 = decay_length.astype(np.float32)
+        Eshower_f32 = Eshower.astype(np.float32)
+
+        # the geocentric and geodetic location of every station
+        stations_geocentric = np.array([Ag.stations[i]["geocentric"] for i in range(n_stations)])
+        stations_geodetic = np.array([Ag.stations[i]["geodetic"] for i in range(n_stations)])
+
+        # the altitude and horizon angle of each station only depend
+        # on the station location so we compute them once up front
+        detector_altitudes = stations_geodetic[:, 2]
+        horizon_angles = geometry.horizon_angle(detector_altitudes)
+
+        def process_station(i: int) -> np.ndarray:
+            """
+            Compute the trigger of every trial for the i'th station.
+            """
+
+            ground_view = geometry.view_angle(Ag.trials, stations_geocentric[i], Ag.axis)
+
+            trigger = np.zeros(Ag.trials.shape[0], dtype=bool)
 
-            trigger = np.zeros(Ag.trials.shape[0])
+            # the indices of the trials in sight of this station - we gather every
+            # per-trial array with these rather than re-scanning a boolean mask
+            in_sight = np.flatnonzero(ground_view <= maxview)
 
-            in_sight = ground_view <= maxview
+            # if no trials are in sight of this station, it cannot trigger
+            if in_sight.size == 0:
+                return trigger
 
-            distance_to_decay = geometry.norm(Ag.stations[i]["geocentric"] - decay_point[in_sight])
+            # the decay points in sight of this station
+            decay_point_in_sight = decay_point[in_sight]
+
+            distance_to_decay = geometry.norm(stations_geocentric[i] - decay_point_in_sight).astype(np.float32)
 
             # calculate the view angle from the decay points
-            decay_view = geometry.decay_view(decay_point[in_sight], Ag.axis, Ag.stations[i]["geocentric"])
+            decay_view = geometry.decay_view(decay_point_in_sight, Ag.axis, stations_geocentric[i])
 
             # the zenith and azimuth (measured from East to North) from the station to each decay point
-            theta, phi = geometry.obs_zenith_azimuth(Ag.stations[i], decay_point[in_sight], decay_point_spherical[in_sight])
+            theta, phi = geometry.obs_zenith_azimuth(Ag.stations[i], decay_point_in_sight, decay_point_spherical[in_sight])
 
             phi_from_boresight = (phi - np.deg2rad(Ag.orientations[i]) + np.pi) % (2*np.pi) - np.pi
 
-            detector_altitude = Ag.stations[i]["geodetic"][2] 
+            detector_altitude = detector_altitudes[i]
 
-            dbeacon = geometry.norm(Ag.stations[i]["geocentric"] - Ag.trials[in_sight])
+            dbeacon = geometry.norm(stations_geocentric[i] - Ag.trials[in_sight])
 
             # compute the voltage at each of these off-axis angles and at each frequency
             V = voltage(
-                np.rad2deg(decay_view),
-                np.rad2deg(exit_zenith[in_sight]),
-                decay_altitude[in_sight],
-                decay_length[in_sight],
-                np.rad2deg(decay_zenith[in_sight]),
-                np.rad2deg(decay_azimuth[in_sight]),
+                np.rad2deg(decay_view, dtype=np.float32),
+                exit_zenith_deg[in_sight],
+                decay_altitude_f32[in_sight],
+                decay_length_f32[in_sight],
+                decay_zenith_deg[in_sight],
+                decay_azimuth_deg[in_sight],
                 distance_to_decay,
                 detector_altitude,
-                Ag.stations[i]["geodetic"],
+                stations_geodetic[i],
                 dbeacon,
                 freqs,
-                Eshower[in_sight],
-                np.rad2deg(theta),
-                np.rad2deg(phi_from_boresight),
+                Eshower_f32[in_sight],
+                np.rad2deg(theta, dtype=np.float32),
+                np.rad2deg(phi_from_boresight, dtype=np.float32),
                 Ag.fov[i],
                 detector,
             )
@@ -151,30 +185,44 @@ def calculate(
             # calculate the SNR
             SNR = np.sqrt(Ag.antennas[i]) * (V / vrms)
 
-            # and check for a trigger
-            trigger[in_sight] = SNR > trigger_SNR
-            
-            height = Ag.stations[i]["geodetic"][2]
-
             # and the particles that appear to be below the horizon
             # remember: more negative is below the horizon
-            above = (np.pi/2 - theta) > geometry.horizon_angle(height)
+            above = (np.pi/2 - theta) > horizon_angles[i]
+
+            # and check for a trigger - if the event is above the horizon, we
+            # would not find them in the search as they would be treated as background
+            trigger[in_sight] = (SNR > trigger_SNR) & ~above
+
+            return trigger
+
+        # the stations are independent so they can optionally be evaluated in
+        # threads - this is serial by default since much of the voltage
+        # calculation holds the GIL and callers (i.e. scripts/skymap) already
+        # parallelize over processes
+        if max_workers <= 1 or n_stations == 1:
+            station_triggers = [process_station(i) for i in range(n_stations)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(n_stations, max_workers)) as pool:
+                station_triggers = list(pool.map(process_station, range(n_stations)))
 
-            # if the event is above the horizon, we would not find
-            # them in the search as they would be treated as background
-            trigger[in_sight][above] = 0.0
+        # an (n_stations, N) boolean array of the triggers from each station
+        Ptrig = np.asarray(station_triggers)
 
-            triggers = triggers + trigger
+        # a trial is detected if any station triggered on it
+        Pdet = np.any(Ptrig, axis=0)
+        num_triggers = np.count_nonzero(Pdet)
 
-        coincidences = np.sum(triggers > 1)
-        Pdet = triggers > 0
-        num_triggers = np.sum(Pdet)
+        # and it is a coincidence if more than one station triggered
+        coincidences = np.count_nonzero(np.count_nonzero(Ptrig, axis=0) > 1)
 
         # and save the various effective area coefficients at these angles
         geometric = (Ag.area * np.sum(Ag.dot)) / Ag.N
         pexit = np.mean(Pexit)
         pdet = np.mean(Pdet)
-        effective_area = np.sum(Ag.area * Ag.dot * Pexit * Pdet) / Ag.N
+        # masked (non-exiting) trials contribute nothing to the effective area
+        effective_area = Ag.area * np.einsum(
+            "i,i,i->", Ag.dot, np.ma.filled(Pexit, 0.0), Pdet.astype(np.float64)
+        ) / Ag.N
         with np.errstate(divide='ignore', invalid='ignore'):
             coincidence_frac = coincidences/num_triggers
 
@@ -257,7 +257,7 @@ def distance_interp(
         values,
         np.column_stack(
             (decay, zenith, view)
-        ),
+        ).astype(np.float64),
         extrap_options.LINEAR
     )
 
@@ -309,7 +309,7 @@ def efield_interp(
             values,
             np.column_stack(
                 (np.repeat(freqs[i], zenith.shape[-1]), decay, zenith, view)
-            ),
+            ).astype(np.float64),
             extrap_options.LINEAR
         )
 
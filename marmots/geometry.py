@@ -401,7 +401,7 @@ def cartesian_to_spherical(point):
     spherical = np.empty((point.shape[0], 3))
 
     spherical[:,0] = norm(point)
-    spherical[:,1] = np.arccos(point[:,2]/norm(point))
+    spherical[:,1] = np.arccos(point[:,2]/spherical[:,0])
     spherical[:,2] = np.arctan2(point[:,1], point[:,0])
 
     return spherical
@@ -122,7 +122,7 @@ class Tau_Decay_Simulator:
 
 
     def sample_energy_fraction(self, num_events=1, type='shower'):
-        # generate random samples from a weighted array using numpy.random.choice
+        # generate random samples from a weighted array by inverting its CDF
         if(type == 'shower'):
             bins = (self.shower_energybins[:-1] + self.shower_energybins[1:])/2.
             weights = self.shower_frac
@@ -133,7 +133,11 @@ class Tau_Decay_Simulator:
             bins = (self.em_energybins[:-1] + self.em_energybins[1:])/2.
             weights = self.em_frac
 
-        samps = np.random.choice(bins,num_events, p=weights)
+        # this is what numpy.random.choice does internally, without
+        # re-validating the weights on every call
+        cdf = np.cumsum(weights)
+        cdf /= cdf[-1]
+        samps = bins[np.searchsorted(cdf, np.random.random(num_events), side='right')]
         return samps
     
     
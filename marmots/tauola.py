@@ -3,39 +3,143 @@ This module provides methods to randomly sample the included TAUOLA decay
 file for various parameters including shower types, and fractional shower
 energies.
 """
+import functools
+import hashlib
+import os
 import os.path as path
+import tempfile
+from typing import Any, NamedTuple
 
 import numpy as np
+from numba import njit, prange
 
-from marmots import ShowerType, data_directory
+from marmots import ShowerType, cache_directory, data_directory
 
 # the methods we export during an `import *`.
 __all__ = ["sample_energy_fraction", "sample_shower_type", "sample_range"]
 
-# and load the decay file on import
-decays = np.loadtxt(
-    path.join(data_directory, ("tauola_decay.dat")),
-    skiprows=1,
-    dtype=[
-        ("nu_tau", float),
-        ("nu_mu", float),
-        ("nu_e", float),
-        ("hadron", float),
-        ("muon", float),
-        ("electron", float),
+# the sorted shower energies and shower counts from the TAUOLA decay file
+Decays = NamedTuple(
+    "Decays",
+    [
+        ("Eem", np.ndarray),
+        ("Ehad", np.ndarray),
+        ("Nem", int),
+        ("Nhad", int),
+        ("Nshowers", int),
+        ("Ndecays", int),
     ],
 )
 
-# the number of electromagnetic or hadronic showers
-Nem = np.sum(decays["electron"] > 0.0)
-Nhad = np.sum(decays["hadron"] > 0.0)
 
-# the total nmuber of EM or hadronic showers in the decay file
-Nshowers = np.sum(np.logical_or(decays["electron"] > 0.0, decays["hadron"] > 0.0))
+@functools.lru_cache(maxsize=None)
+def _load_decays() -> Decays:
+    """
+    Load the sorted EM and hadronic shower energies from the TAUOLA decay file.
+
+    Parsing the text file is slow so this is deferred until the first sample
+    is drawn. The result is also saved as a `.npz` file in `cache_directory`
+    so that later sessions can skip the parsing entirely.
+
+    Returns
+    -------
+    decays: Decays
+        The sorted shower energies and the number of each type of shower.
+    """
+
+    # the text decay file
+    datfile = path.abspath(path.join(data_directory, "tauola_decay.dat"))
+
+    # and the converted copy - keyed by the decay file's location
+    key = hashlib.sha1(datfile.encode()).hexdigest()[:12]
+    npzfile = path.join(cache_directory, f"tauola_decay-{key}.npz")
+
+    # reuse the converted copy if it is at least as new as the decay file
+    if path.exists(npzfile) and (
+        not path.exists(datfile) or path.getmtime(npzfile) >= path.getmtime(datfile)
+    ):
+        try:
+            with np.load(npzfile) as f:
+                return Decays(
+                    f["Eem"],
+                    f["Ehad"],
+                    int(f["Nem"]),
+                    int(f["Nhad"]),
+                    int(f["Nshowers"]),
+                    int(f["Ndecays"]),
+                )
+        except Exception:
+            # the converted copy is unreadable so fall back to the decay file
+            pass
+
+    decays = np.loadtxt(
+        datfile,
+        skiprows=1,
+        dtype=[
+            ("nu_tau", float),
+            ("nu_mu", float),
+            ("nu_e", float),
+            ("hadron", float),
+            ("muon", float),
+            ("electron", float),
+        ],
+    )
+
+    # the total nmuber of EM or hadronic showers in the decay file
+    Nshowers = int(
+        np.count_nonzero(
+            np.logical_or(decays["electron"] > 0.0, decays["hadron"] > 0.0)
+        )
+    )
+
+    # the sorted fractional shower energies for hadronic and EM showers - these
+    # are stored as plain contiguous float64 arrays for the jitted samplers
+    Eem = np.ascontiguousarray(
+        np.sort(decays["electron"][decays["electron"] > 0.0]), dtype=np.float64
+    )
+    Ehad = np.ascontiguousarray(
+        np.sort(decays["hadron"][decays["hadron"] > 0.0]), dtype=np.float64
+    )
+
+    result = Decays(Eem, Ehad, Eem.size, Ehad.size, Nshowers, int(decays.size))
+
+    # try and save the converted copy - we write to a temporary file and
+    # atomically move it into place so that concurrent processes never
+    # see a partially written file
+    tmpfile = None
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+        fd, tmpfile = tempfile.mkstemp(dir=cache_directory, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **result._asdict())
+        os.replace(tmpfile, npzfile)
+    except OSError:
+        # the cache isn't writable - we just parse the decay file next time
+        if tmpfile is not None and path.exists(tmpfile):
+            os.remove(tmpfile)
+
+    return result
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Provide lazy module-level access to the decay constants i.e. `tauola.Eem`.
+
+    If the decay file cannot be loaded, this raises AttributeError so that
+    `hasattr` and `getattr` with a default behave as for a missing attribute.
+    """
+    if name in Decays._fields:
+        try:
+            return getattr(_load_decays(), name)
+        except OSError as err:
+            raise AttributeError(
+                f"module {__name__!r} cannot load {name!r}: {err}"
+            ) from err
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-# the sorted fractional shower energies for hadronic and EM showers
-Eem = np.sort(decays["electron"][decays["electron"] > 0.0])
-Ehad = np.sort(decays["hadron"][decays["hadron"] > 0.0])
+# the integer shower type of EM showers - a plain int so Numba treats it as a constant
+EM = int(ShowerType.Electromagnetic)
 
 
 def sample_shower_energies(Etau: float, N: int = 1) -> np.ndarray:
@@ -90,16 +194,70 @@ def sample_energy_fraction(stypes: np.ndarray) -> np.ndarray:
     # generate N uniform samples to sample our CDFs
     u = np.random.uniform(size=stypes.size)
 
-    # create the array to store the energy fractions
-    fractions = np.zeros_like(u)
+    # and invert the EM or hadronic CDF for each shower
+    decays = _load_decays()
+
+    return _sample_fractions(np.asarray(stypes), u, decays.Eem, decays.Ehad)
+
 
-    # the indices that correspond to electromagnetic and hadronic showers
-    emshowers = stypes == ShowerType.Electromagnetic
-    hadshowers = stypes == ShowerType.Hadronic
+@njit(cache=True, fastmath=True)
+def _invert_cdf(x: float, energies: np.ndarray) -> float:
+    """
+    Linearly interpolate the sorted `energies` at the CDF coordinate `x`.
+
+    This is `np.interp(x, np.arange(energies.size), energies)` but, as the
+    CDF coordinates are the integers, the bracketing indices are found
+    directly rather than with a binary search.
+    """
 
-    # interpolate into the sorted shower energies for EM
-    fractions[emshowers] = np.interp(Nem * u[emshowers], np.arange(Nem), Eem)
-    fractions[hadshowers] = np.interp(Nhad * u[hadshowers], np.arange(Nhad), Ehad)
+    # the index of the sorted energy just below x
+    k = int(x)
+
+    # np.interp clamps to the last energy beyond the end of the table
+    if k >= energies.size - 1:
+        return energies[-1]
+
+    # and linearly interpolate between the neighbouring energies
+    f = x - k
+    return energies[k] * (1.0 - f) + energies[k + 1] * f
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _sample_fractions(
+    stypes: np.ndarray,
+    u: np.ndarray,
+    Eem: np.ndarray,
+    Ehad: np.ndarray,
+) -> np.ndarray:
+    """
+    Invert the EM or hadronic shower energy CDF at each uniform
+    sample in `u` in a single pass over `stypes`.
+
+    Parameters
+    ----------
+    stypes: np.ndarray
+        An (N,)-length ndarray containing integer
+        representations of shower types.
+    u: np.ndarray
+        An (N,)-length ndarray of uniform samples on [0, 1).
+    Eem, Ehad: np.ndarray
+        The sorted EM and hadronic fractional shower energies.
+
+    Returns
+    -------
+    fraction: np.ndarray
+        The fraction of primary energy that is transferred into each shower.
+    """
+
+    # create the array to store the energy fractions
+    fractions = np.empty(stypes.size)
+
+    # interpolate into the sorted shower energies for this shower type
+    for i in prange(stypes.size):
+        if stypes[i] == EM:
+            fractions[i] = _invert_cdf(Eem.size * u[i], Eem)
+        else:
+            fractions[i] = _invert_cdf(Ehad.size * u[i], Ehad)
 
     # and we are done
     return fractions
@@ -123,16 +281,11 @@ def sample_shower_type(N: int = 1) -> np.ndarray:
     u = np.random.uniform(0, 1, size=N)
 
     # and the probability that a shower is electromagnetic
-    Pem = Nem / Nshowers
-
-    # create the array to store each shower type
-    stypes = np.zeros(N, dtype=int)
+    decays = _load_decays()
+    Pem = decays.Nem / decays.Nshowers
 
-    # and fill in the electromagnetic (non-zero)
-    stypes[u > Pem] = ShowerType.Electromagnetic
-
-    # and we are done
-    return stypes
+    # and the showers are electromagnetic (1) above Pem and hadronic (0) otherwise
+    return (u > Pem).astype(int)
 
 
 def sample_range(Etau: np.ndarray) -> np.ndarray:
@@ -157,4 +310,14 @@ def sample_range(Etau: np.ndarray) -> np.ndarray:
     ranges: np.ndarray
         An (N,)-length ndarray containing random tau ranges in km.
     """
-    return np.random.exponential(4.9e-17 * Etau)
+    Etau = np.asarray(Etau, dtype=np.float64)
+
+    # draw unit exponentials from the global stream
+    ranges = np.random.standard_exponential(Etau.shape)
+
+    # and scale them by the mean decay length in place
+    ranges *= Etau
+    ranges *= 4.9e-17
+
+    # a scalar energy gives a scalar range like np.random.exponential
+    return ranges[()]
@@ -53,3 +53,144 @@ def test_effective_area():
 
     # and save the plot
     fig.savefig(f"{figdir}/effective_area.pdf")
+
+
+def single_station(voltage, altitude: float = 3.8):
+    """
+    Run effective_area.calculate for a single station using stub tau and
+    detector models, passing every voltage call through to `voltage`.
+
+    Returns the calculate output and the number of trials.
+    """
+
+    import marmots.effective_area as effective_area
+
+    # the number of trials seen by the tau exit stub
+    trials = {}
+
+    class TauExit:
+        """Every trial exits with a 1 EeV tau."""
+
+        def __call__(self, exit_zenith):
+            trials["N"] = exit_zenith.size
+            return np.ma.masked_array(np.ones(exit_zenith.size)), np.full(exit_zenith.size, 1e18)
+
+    class TauDecay:
+        """Long decay lengths so many decays appear above the horizon."""
+
+        def sample_range(self, Etau):
+            return np.random.exponential(50.0, Etau.size)
+
+        def shower_energy(self, Etau):
+            return 0.5 * Etau
+
+    class Detector:
+        def Vrms(self, freqs):
+            return 1.0
+
+    # a source that puts decays on both sides of the station's horizon
+    np.random.seed(0)
+    results = effective_area.calculate(
+        60.0,
+        50.0,
+        np.array([37.6]),
+        np.array([-118.2]),
+        np.array([altitude]),
+        np.array([0.0]),
+        np.array([360.0]),
+        np.array([4.0]),
+        TauExit(),
+        voltage,
+        TauDecay(),
+        Detector(),
+        maxview=np.radians(6.0),
+        N=5000,
+    )
+
+    return results, trials["N"]
+
+
+def test_horizon_cut():
+    """
+    Check that decays that appear above the horizon never trigger.
+    """
+
+    import marmots.geometry as geometry
+
+    # the zenith angles recorded by the voltage stub
+    recorded = {}
+
+    def voltage(*args):
+        # record the zenith angle (in degrees) and make every decay bright
+        recorded["theta"] = np.asarray(args[12])
+        return np.full(args[0].size, 1e6)
+
+    altitude = 3.8
+    (_, _, pdet, _, _), N = single_station(voltage, altitude)
+
+    # the in-sight decays that appear above the horizon
+    theta = recorded["theta"]
+    above = (90.0 - theta) > np.rad2deg(geometry.horizon_angle(altitude))
+
+    # make sure this setup actually exercises the cut
+    assert np.any(above)
+    assert np.any(~above)
+
+    # every below-horizon decay triggers and no above-horizon decay does
+    assert pdet == np.count_nonzero(~above) / N
+    assert pdet < theta.size / N
+
+
+def test_voltage_interpolation_dtypes():
+    """
+    Check that the E-field interpolators accept the arrays that
+    calculate passes to the voltage model.
+    """
+
+    from interpolation.splines import CGrid
+
+    import marmots.efield as efield
+
+    # the arguments of the voltage call
+    recorded = {}
+
+    def voltage(*args):
+        recorded["args"] = args
+        return np.zeros(args[0].size)
+
+    single_station(voltage)
+
+    view, exit_zenith, decay_altitude = recorded["args"][:3]
+    freqs = recorded["args"][10]
+
+    # synthetic distance and E-field tables over (decay, zenith, view)
+    # and (freq, decay, zenith, view) like the BEACON parameterization
+    rng = np.random.default_rng(0)
+    dist_grid = CGrid((0.0, 10.0, 11), (0.0, 90.0, 19), (0.0, 10.0, 11))
+    dist_values = rng.random((11, 19, 11))
+    efield_grid = CGrid((30.0, 80.0, 6), (0.0, 10.0, 11), (0.0, 90.0, 19), (0.0, 10.0, 11))
+    efield_values = rng.random((6, 11, 19, 11))
+
+    # interpolate with the arrays as passed and in double precision
+    distance = efield.distance_interp(dist_grid, dist_values, decay_altitude, exit_zenith, view)
+    expected = efield.distance_interp(
+        dist_grid,
+        dist_values,
+        decay_altitude.astype(np.float64),
+        exit_zenith.astype(np.float64),
+        view.astype(np.float64),
+    )
+    assert np.allclose(distance, expected)
+
+    efields = efield.efield_interp(
+        efield_grid, efield_values, freqs, decay_altitude, exit_zenith, view
+    )
+    expected = efield.efield_interp(
+        efield_grid,
+        efield_values,
+        freqs,
+        decay_altitude.astype(np.float64),
+        exit_zenith.astype(np.float64),
+        view.astype(np.float64),
+    )
+    assert np.allclose(efields, expected)
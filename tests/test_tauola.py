@@ -1,6 +1,16 @@
+from os.path import exists, join
+
 import numpy as np
 
-import poinsseta.tauola as tauola
+import marmots.tauola as tauola
+from marmots import data_directory
+
+
+def files_missing() -> bool:
+    """
+    Return True if the TAUOLA decay file is missing.
+    """
+    return not exists(join(data_directory, "tauola_decay.dat"))
 
 
 def test_constants():
@@ -8,8 +18,12 @@ def test_constants():
     Perform some sanity checks on the tauola.py constants.
     """
 
+    # check if we have the decay file
+    if files_missing():
+        return
+
     # make sure the shower counts all make sense
-    assert tauola.Nshowers < tauola.decays.size
+    assert tauola.Nshowers < tauola.Ndecays
     assert tauola.Nem < tauola.Nshowers
     assert tauola.Nhad < tauola.Nshowers
 
@@ -23,6 +37,10 @@ def test_sample_energy_fraction():
     Perform some basic sanity checks on sample_energy_fraction
     """
 
+    # check if we have the decay file
+    if files_missing():
+        return
+
     # generate a bunch of shower types
     stypes = tauola.sample_shower_type(1000)
 
@@ -39,6 +57,10 @@ def test_sample_shower_type():
     Perform some sanity checks on sample_shower_type.
     """
 
+    # check if we have the decay file
+    if files_missing():
+        return
+
     # sample a bunch of shower types
     stypes = tauola.sample_shower_type(1000)
 
@@ -62,3 +84,6 @@ def test_sample_range():
 
     # and are all within some sensible limit
     assert np.all(ranges < 4.7e6)
+
+    # and a single energy gives a single range
+    assert isinstance(tauola.sample_range(1e17), float)